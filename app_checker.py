@@ -1,84 +1,213 @@
+import asyncio
+import csv
+import os
 import pandas as pd
-import time
 import random
-from playwright.sync_api import sync_playwright
-from thefuzz import fuzz # pip install thefuzz
+import re
+from playwright.async_api import async_playwright
+from rapidfuzz import fuzz, process # pip install rapidfuzz
 
 # ================= CONFIGURATION =================
 # We use the file we just created in the previous step (with locations)
 INPUT_FILE = "Restaurant_in_rawalpindi_results_with_location.csv" 
 OUTPUT_FILE = "Final_App_Analysis.csv"
+PROGRESS_FILE = "app_checker_progress.csv"  # Finished searches of an interrupted run; removed once a run completes
+PROGRESS_FIELDS = ['Key', 'Best_App_Name', 'Best_Score']
 MATCH_THRESHOLD = 80 
+WORKERS = 8  # Parallel browser contexts sharing one browser
+# Set DEBUG_HEADFUL=1 to watch the browser
+HEADLESS = os.environ.get("DEBUG_HEADFUL", "").strip().lower() not in ("1", "true", "yes", "on")
+BROWSER_ARGS = ["--disable-dev-shm-usage"]
+# Only the result anchors are read, so none of these need to load (scripts/XHR still do)
+BLOCKED_RESOURCES = {"image", "media", "font", "stylesheet"}
 # =================================================
 
-def check_apps_clean_output():
+_SPACES_RE = re.compile(r"\s+")
+
+def normalize_name(name):
+    """Cache key for a restaurant name: lowercased with whitespace collapsed."""
+    return _SPACES_RE.sub(" ", name.strip().lower())
+
+def drop_torn_progress_row():
+    """Truncates the progress file back to its last line break.
+
+    A row without a line terminator was cut off by a crash (possibly inside the score), so it is
+    discarded and that restaurant is searched again.
+    """
+    try:
+        with open(PROGRESS_FILE, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+    except FileNotFoundError:
+        pass
+
+def load_progress():
+    """Returns {normalized name: (best_app_name, best_score)} for searches finished on earlier runs."""
+    drop_torn_progress_row()
+    done = {}
+    try:
+        with open(PROGRESS_FILE, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                # Skip malformed rows rather than failing the whole resume
+                try:
+                    if row['Key'] is None or row['Best_App_Name'] is None:
+                        continue
+                    done[row['Key']] = (row['Best_App_Name'], int(row['Best_Score']))
+                except (TypeError, ValueError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return done
+
+async def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def search_play_store(page, restaurant_name):
+    """Searches the Play Store and returns the best (app_name, score) among the top 3 results."""
+    encoded_name = restaurant_name.replace(" ", "%20")
+    search_url = f"https://play.google.com/store/search?q={encoded_name}&c=apps"
+
+    await page.goto(search_url, timeout=10000)
+
+    # Check top 3 results
+    app_links = await page.locator('a[href^="/store/apps/details"]').all()
+
+    titles = []
+    for link in app_links[:3]: 
+        try:
+            app_title = (await link.inner_text()).split('\n')[0]
+            if not app_title.strip(): continue
+            titles.append(app_title)
+        except:
+            continue
+
+    best_score = 0
+    best_app_name = "N/A"
+
+    # Score all candidates in one C call; ties keep the higher-ranked result
+    match = process.extractOne(restaurant_name.lower(), [t.lower() for t in titles], scorer=fuzz.partial_ratio)
+    if match and match[1] > 0:
+        best_score = round(match[1])
+        best_app_name = titles[match[2]]
+
+    return best_app_name, best_score
+
+async def worker(page, queue, results, failed, cache, save_progress, total):
+    """Pulls restaurants off the queue until it is empty, appending one result row per restaurant
+    (or the name to `failed` when its search errors).
+
+    Searches are memoized in `cache` by normalized name, so repeated names share one navigation
+    (including a search another worker still has in flight). Fresh searches are handed to
+    `save_progress` as they finish so an interrupted run can resume.
+    """
+    while True:
+        try:
+            index, restaurant_name = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+
+        print(f"[{index+1}/{total}] Checking: {restaurant_name}...")
+
+        key = normalize_name(restaurant_name)
+        search = cache.get(key)
+        cached = search is not None
+        if not cached:
+            search = cache[key] = asyncio.create_task(search_play_store(page, restaurant_name))
+
+        try:
+            best_app_name, best_score = await search
+            if not cached:
+                save_progress({'Key': key, 'Best_App_Name': best_app_name, 'Best_Score': best_score})
+            has_app = best_score >= MATCH_THRESHOLD
+            results.append({
+                "index": index,
+                "Has_App": has_app,
+                "App_Name_Found": best_app_name if has_app else "N/A",
+                "Potential_Match_Score": best_score,
+            })
+
+            if has_app:
+                print(f"   ✅ MATCH! {restaurant_name} -> '{best_app_name}' ({best_score}%)")
+            else:
+                print(f"   ❌ No App for {restaurant_name}. Best partial: '{best_app_name}' ({best_score}%)")
+
+        except Exception as e:
+            print(f"   ⚠️ Error ({restaurant_name}): {e}")
+            failed.append(restaurant_name)
+            # Let a later duplicate retry instead of reusing the failure
+            if not cached:
+                cache.pop(key, None)
+
+        # Per-worker jitter to stay polite (only needed after a real navigation)
+        if not cached:
+            await asyncio.sleep(random.uniform(0.5, 1.5))
+
+async def check_apps_clean_output():
     # 1. Load Data
-    try:w
+    try:
         df = pd.read_csv(INPUT_FILE)
         print(f"📂 Loaded {len(df)} restaurants from {INPUT_FILE}")
     except FileNotFoundError:
         print(f"❌ Error: Could not find {INPUT_FILE}. Make sure you ran the Maps Scraper first.")
         return
 
-    # Initialize new columns
-    df['Has_App'] = False
-    df['App_Name_Found'] = "N/A"
-    df['Potential_Match_Score'] = 0
     # Note: 'Link' (Location Link) is already in the dataframe from the input file
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-
-        print("🚀 Starting Play Store Analysis...")
-
-        for index, row in df.iterrows():
-            restaurant_name = str(row['Name'])
-            if restaurant_name == "Unknown": continue
-
-            print(f"[{index+1}/{len(df)}] Checking: {restaurant_name}...")
-
-            encoded_name = restaurant_name.replace(" ", "%20")
-            search_url = f"https://play.google.com/store/search?q={encoded_name}&c=apps"
-            
-            try:
-                page.goto(search_url, timeout=10000)
-                
-                # Check top 3 results
-                app_links = page.locator('a[href^="/store/apps/details"]').all()
-                
-                best_score = 0
-                best_app_name = "N/A"
-
-                for link in app_links[:3]: 
-                    try:
-                        app_title = link.inner_text().split('\n')[0]
-                        if not app_title.strip(): continue
-
-                        score = fuzz.partial_ratio(restaurant_name.lower(), app_title.lower())
-
-                        if score > best_score:
-                            best_score = score
-                            best_app_name = app_title
-                    except:
-                        continue
-                
-                # Store Data
-                if best_score >= MATCH_THRESHOLD:
-                    df.at[index, 'Has_App'] = True
-                    df.at[index, 'App_Name_Found'] = best_app_name
-                    df.at[index, 'Potential_Match_Score'] = best_score
-                    print(f"   ✅ MATCH! '{best_app_name}' ({best_score}%)")
-                else:
-                    df.at[index, 'Potential_Match_Score'] = best_score
-                    print(f"   ❌ No App. Best partial: '{best_app_name}' ({best_score}%)")
+    queue = asyncio.Queue()
+    for index, row in df.iterrows():
+        restaurant_name = str(row['Name'])
+        if restaurant_name == "Unknown": continue
+        queue.put_nowait((index, restaurant_name))
+
+    results = []
+    failed = []
 
-            except Exception as e:
-                print(f"   ⚠️ Error: {e}")
+    # Searches finished on a previous run are served straight from the cache
+    loop = asyncio.get_running_loop()
+    cache = {}
+    for key, outcome in load_progress().items():
+        cache[key] = loop.create_future()
+        cache[key].set_result(outcome)
+    if cache:
+        print(f"♻️ Resuming: {len(cache)} searches already done in {PROGRESS_FILE}")
 
-            time.sleep(random.uniform(0.5, 1.5))
+    with open(PROGRESS_FILE, 'a', newline='', encoding='utf-8') as progress_file:
+        writer = csv.DictWriter(progress_file, fieldnames=PROGRESS_FIELDS)
+        if progress_file.tell() == 0:
+            writer.writeheader()
 
-        browser.close()
+        def save_progress(row):
+            writer.writerow(row)
+            progress_file.flush()
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=HEADLESS, args=BROWSER_ARGS)
+
+            # One isolated context + page per worker, all on the same browser
+            pages = []
+            for _ in range(WORKERS):
+                context = await browser.new_context()
+                await context.route("**/*", block_heavy_resources)
+                pages.append(await context.new_page())
+
+            print(f"🚀 Starting Play Store Analysis ({WORKERS} workers)...")
+
+            await asyncio.gather(*(worker(page, queue, results, failed, cache, save_progress, len(df)) for page in pages))
+
+            await browser.close()
+
+    # Store Data: build the new columns in one go and join them on the row index
+    res_df = pd.DataFrame(results, columns=['index', 'Has_App', 'App_Name_Found', 'Potential_Match_Score']).set_index('index')
+    df = df.join(res_df)
+
+    # Rows that were skipped or errored keep the defaults
+    df['Has_App'] = df['Has_App'].eq(True)
+    df['App_Name_Found'] = df['App_Name_Found'].fillna("N/A")
+    df['Potential_Match_Score'] = df['Potential_Match_Score'].fillna(0).astype(int)
 
     # 2. SORTING (Highest Match First)
     print("\n🔄 Sorting data...")
@@ -103,6 +232,13 @@ def check_apps_clean_output():
     # 4. Save Final File
     final_df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
 
+    # A clean run is complete, so the next one (likely on fresh Maps data) must not reuse these scores.
+    # If anything failed, keep the finished searches so a rerun only retries the failed names.
+    if failed:
+        print(f"\n⚠️ {len(failed)} searches failed. Keeping {PROGRESS_FILE}; rerun to retry only those restaurants.")
+    else:
+        os.remove(PROGRESS_FILE)
+
     print("\n" + "="*40)
     print(f"🎉 DONE! Saved to: {OUTPUT_FILE}")
     print("Columns included:")
@@ -114,4 +250,4 @@ def check_apps_clean_output():
     print("="*40)
 
 if __name__ == "__main__":
-    check_apps_clean_output()
\ No newline at end of file
+    asyncio.run(check_apps_clean_output())
\ No newline at end of file
@@ -1,7 +1,30 @@
 
+import os
 import re
 import pandas as pd
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+# Set DEBUG_HEADFUL=1 to watch the browser
+HEADLESS = os.environ.get("DEBUG_HEADFUL", "").strip().lower() not in ("1", "true", "yes", "on")
+BROWSER_ARGS = ["--disable-dev-shm-usage"]
+# Only DOM text/attributes are scraped, so skip the heavy assets (tiles, photos, fonts)
+BLOCKED_RESOURCES = {"image", "media", "font"}
+SCROLL_TIMEOUT_MS = 5000  # Give up once the feed stops growing for this long
+END_OF_LIST_TEXT = "You've reached the end of the list"
+
+# Pulls every field we need from all cards in one round-trip instead of several locator calls per card
+EXTRACT_CARDS_JS = """
+() => Array.from(document.querySelectorAll('div[role="article"]')).map(c => ({
+    name: c.getAttribute('aria-label') || c.querySelector('.fontHeadlineSmall')?.innerText || null,
+    aria: c.querySelector('span[role="img"]')?.getAttribute('aria-label') || null,
+    href: c.querySelector('a')?.getAttribute('href') || null,
+    text: c.innerText || '',
+}))
+"""
+
+# Coordinate pattern, compiled once instead of on every listing.
+# One alternation covers both URL forms so the URL is scanned in a single pass.
+_COORD_RE = re.compile(r'!3d(?P<lat>[-0-9.]+)!4d(?P<lon>[-0-9.]+)|@(?P<alat>[-0-9.]+),(?P<alon>[-0-9.]+)')
 
 def extract_coordinates(url):
     """
@@ -12,18 +35,19 @@ def extract_coordinates(url):
         return "N/A", "N/A"
         
     try:
-        # Priority 1: Look for the precise data entity (!3d and !4d)
+        # Priority 1: The precise data entity (!3d and !4d)
         # Example: ...!8m2!3d33.6424886!4d73.0722253...
-        lat_match = re.search(r'!3d([-0-9.]+)', url)
-        long_match = re.search(r'!4d([-0-9.]+)', url)
-        
-        if lat_match and long_match:
-            return lat_match.group(1), long_match.group(1)
-        
-        # Priority 2: Look for @lat,long (Less precise, usually map center, but fallback)
-        at_match = re.search(r'@([-0-9.]+),([-0-9.]+)', url)
-        if at_match:
-            return at_match.group(1), at_match.group(2)
+        # Priority 2: @lat,long (Less precise, usually map center, but fallback)
+        # The @ form usually appears earlier in the URL, so remember it and keep scanning.
+        fallback = None
+        for m in _COORD_RE.finditer(url):
+            if m['lat']:
+                return m['lat'], m['lon']
+            if fallback is None:
+                fallback = (m['alat'], m['alon'])
+
+        if fallback:
+            return fallback
             
         return "N/A", "N/A"
     except:
@@ -32,8 +56,9 @@ def extract_coordinates(url):
 def scrape_google_maps(search_query):
     with sync_playwright() as p:
         # 1. Launch Browser
-        browser = p.chromium.launch(headless=False)
+        browser = p.chromium.launch(headless=HEADLESS, args=BROWSER_ARGS)
         context = browser.new_context()
+        context.route("**/*", lambda route: route.abort() if route.request.resource_type in BLOCKED_RESOURCES else route.continue_())
         page = context.new_page()
 
         # 2. Navigate
@@ -58,22 +83,25 @@ def scrape_google_maps(search_query):
 
         # 5. Scroll Loop (The "Infinite Scroll" Logic)
         print("🔄 Scrolling to load all restaurants...")
-        last_height = page.evaluate('(sel) => document.querySelector(sel).scrollHeight', feed_selector)
-
         while True:
+            # Remember the height, scroll, then wait only as long as it takes for new cards to arrive
+            page.evaluate('(sel) => window.__lastH = document.querySelector(sel).scrollHeight', feed_selector)
             page.evaluate('(sel) => document.querySelector(sel).scrollTo(0, document.querySelector(sel).scrollHeight)', feed_selector)
-            page.wait_for_timeout(2000)
-            new_height = page.evaluate('(sel) => document.querySelector(sel).scrollHeight', feed_selector)
-            
-            if new_height == last_height:
-                page.wait_for_timeout(2000)
-                new_height = page.evaluate('(sel) => document.querySelector(sel).scrollHeight', feed_selector)
-                if new_height == last_height:
-                    break
-            last_height = new_height
+
+            if page.get_by_text(END_OF_LIST_TEXT).count():
+                break
+
+            try:
+                page.wait_for_function(
+                    '(sel) => document.querySelector(sel).scrollHeight > window.__lastH',
+                    arg=feed_selector,
+                    timeout=SCROLL_TIMEOUT_MS,
+                )
+            except PlaywrightTimeoutError:
+                break
 
         # 6. Extraction
-        listings = page.locator('div[role="article"]').all()
+        listings = page.evaluate(EXTRACT_CARDS_JS)
         print(f"📊 Found {len(listings)} restaurants. Extracting Location Data...")
 
         results = []
@@ -82,50 +110,31 @@ def scrape_google_maps(search_query):
             data = {}
             
             # --- Name ---
-            try:
-                if card.get_attribute('aria-label'):
-                    data['Name'] = card.get_attribute('aria-label')
-                else:
-                    data['Name'] = card.locator('.fontHeadlineSmall').first.inner_text()
-            except:
-                data['Name'] = "Unknown"
+            data['Name'] = card['name'] or "Unknown"
             
             # --- Rating ---
-            try:
-                aria_string = card.locator('span[role="img"]').first.get_attribute('aria-label')
-                if aria_string and "stars" in aria_string:
-                    parts = aria_string.split(" ")
-                    data['Rating'] = parts[0]
-                    data['Reviews'] = parts[2] if len(parts) > 2 else "0"
-                else:
-                    data['Rating'] = "N/A"
-                    data['Reviews'] = "0"
-            except:
+            aria_string = card['aria']
+            if aria_string and "stars" in aria_string:
+                parts = aria_string.split(" ")
+                data['Rating'] = parts[0]
+                data['Reviews'] = parts[2] if len(parts) > 2 else "0"
+            else:
                 data['Rating'] = "N/A"
                 data['Reviews'] = "0"
 
             # --- Link & COORDINATES (The New Algo) ---
-            try:
-                link = card.locator('a').first.get_attribute('href')
-                data['Link'] = link
-                
-                # Apply the Location Algo
-                lat, long = extract_coordinates(link)
-                data['Latitude'] = lat
-                data['Longitude'] = long
-            except:
-                data['Link'] = ""
-                data['Latitude'] = "N/A"
-                data['Longitude'] = "N/A"
+            link = card['href'] or ""
+            data['Link'] = link
+            
+            # Apply the Location Algo
+            lat, long = extract_coordinates(link)
+            data['Latitude'] = lat
+            data['Longitude'] = long
 
             # --- Address Text ---
-            try:
-                text_content = card.inner_text()
-                lines = text_content.split('\n')
-                clean_lines = [line for line in lines if line and line != data['Name'] and "Reviews" not in line]
-                data['Address_Snippet'] = clean_lines[0] if clean_lines else "N/A"
-            except:
-                data['Address_Snippet'] = "N/A"
+            lines = card['text'].split('\n')
+            clean_lines = [line for line in lines if line and line != data['Name'] and "Reviews" not in line]
+            data['Address_Snippet'] = clean_lines[0] if clean_lines else "N/A"
 
             if data['Name'] != "Unknown":
                 results.append(data)
@@ -0,0 +1,76 @@
+import importlib
+import os
+import py_compile
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestScriptsCompile(unittest.TestCase):
+    """Catches syntax slips (like a stray 'try:w') without needing Playwright installed."""
+
+    def assert_compiles(self, script):
+        with tempfile.TemporaryDirectory() as tmp:
+            py_compile.compile(os.path.join(ROOT, script), cfile=os.path.join(tmp, "out.pyc"), doraise=True)
+
+    def test_app_checker_compiles(self):
+        self.assert_compiles("app_checker.py")
+
+    def test_maps_scraper_compiles(self):
+        self.assert_compiles("maps_scraper.py")
+
+
+
+class TestProgressFile(unittest.TestCase):
+    """Resume data must never trust a row that a crash cut short."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Imported here so the compile checks above still run without the scraping dependencies
+        sys.path.insert(0, ROOT)
+        cls.app_checker = importlib.import_module("app_checker")
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "progress.csv")
+        original = self.app_checker.PROGRESS_FILE
+        self.app_checker.PROGRESS_FILE = self.path
+        self.addCleanup(setattr, self.app_checker, "PROGRESS_FILE", original)
+
+    def write(self, text):
+        with open(self.path, "w", newline="", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self):
+        with open(self.path, newline="", encoding="utf-8") as f:
+            return f.read()
+
+    def test_row_torn_inside_score_is_dropped(self):
+        self.write("Key,Best_App_Name,Best_Score\r\nmei kong,Mei Kong,100\r\nkfc,KFC App,8")
+
+        self.assertEqual(self.app_checker.load_progress(), {"mei kong": ("Mei Kong", 100)})
+        self.assertEqual(self.read(), "Key,Best_App_Name,Best_Score\r\nmei kong,Mei Kong,100\r\n")
+
+    def test_torn_header_leaves_empty_file(self):
+        self.write("Key,Best_Ap")
+
+        self.assertEqual(self.app_checker.load_progress(), {})
+        self.assertEqual(self.read(), "")
+
+    def test_complete_file_is_untouched(self):
+        text = "Key,Best_App_Name,Best_Score\r\nkfc,KFC App,85\r\nx,N/A,0\r\n"
+        self.write(text)
+
+        self.assertEqual(self.app_checker.load_progress(), {"kfc": ("KFC App", 85), "x": ("N/A", 0)})
+        self.assertEqual(self.read(), text)
+
+    def test_missing_file(self):
+        self.assertEqual(self.app_checker.load_progress(), {})
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()